@@ -1,12 +1,17 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-import uuid
+import hashlib
+import secrets
+import threading
+import time
 from jose import jwt, JWTError
+from jose.backends.native import HMACKey
 import os as os
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from techfest.backend.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from techfest.backend.db.database import get_db, SessionLocal
 from techfest.backend.db import models
 from typing import Optional, Dict, Any
 
@@ -14,60 +19,183 @@ SECRET_KEY = os.getenv("JWT_SECRET", "change-me-in-prod")  # set env var in prod
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Derive the HMAC key object once; jose otherwise rebuilds it from the raw
+# secret string on every encode/decode.
+_HMAC_KEY = HMACKey(SECRET_KEY, ALGORITHM)
+
 # OAuth2 bearer (used only to read Authorization header)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_or_create_user_by_email(db: Session, email: str) -> models.User:
-    user = db.query(models.User).filter(models.User.email == email).first()
+# In-process cache of validated tokens so the hot auth path skips the HMAC
+# verify + Token SELECT for repeat requests. Keyed by a sha256 prefix of the
+# raw bearer token; entries expire after a short TTL (capped at the token's
+# own expiry) so revocations/expiry are picked up quickly.
+TOKEN_CACHE_TTL = 30  # seconds
+TOKEN_CACHE_MAX = 10_000
+_token_cache: Dict[str, tuple] = {}  # hash -> (auth dict, cached_until_epoch)
+_jti_to_hash: Dict[str, str] = {}    # jti -> hash, for invalidation on revoke
+_cache_lock = threading.Lock()
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def _cache_token(h: str, jti: str, auth: Dict[str, Any], expires_epoch: float) -> None:
+    cached_until = min(time.time() + TOKEN_CACHE_TTL, expires_epoch)
+    with _cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX:
+            # cheap bound: drop everything rather than track LRU order
+            _token_cache.clear()
+            _jti_to_hash.clear()
+        _token_cache[h] = (auth, cached_until)
+        _jti_to_hash[jti] = h
+
+
+def _cached_auth(h: str) -> Optional[Dict[str, Any]]:
+    with _cache_lock:
+        hit = _token_cache.get(h)
+        if hit is None:
+            return None
+        auth, cached_until = hit
+        if cached_until <= time.time():
+            _token_cache.pop(h, None)
+            return None
+        return auth
+
+
+def _invalidate_cached_token(jti: str) -> None:
+    with _cache_lock:
+        h = _jti_to_hash.pop(jti, None)
+        if h:
+            _token_cache.pop(h, None)
+
+
+# Negative revocation cache: once the DB confirms a jti is not revoked we
+# remember that for a short window so subsequent requests skip the SELECT.
+# >99% of tokens are never revoked, so this removes one PK lookup per request.
+# Local revocations invalidate immediately; multi-worker deployments would
+# need a shared store (e.g. Redis) for cross-process invalidation.
+NOT_REVOKED_TTL = 60  # seconds
+NOT_REVOKED_MAX = 50_000
+_not_revoked_cache: Dict[str, tuple] = {}  # jti -> (expires_epoch, cached_until_epoch, user_info)
+
+
+def _remember_not_revoked(jti: str, expires_epoch: float, user_info: Optional[Dict[str, Any]]) -> None:
+    with _cache_lock:
+        if len(_not_revoked_cache) >= NOT_REVOKED_MAX:
+            _not_revoked_cache.clear()
+        _not_revoked_cache[jti] = (expires_epoch, time.time() + NOT_REVOKED_TTL, user_info)
+
+
+def _known_not_revoked(jti: str) -> Optional[tuple]:
+    """Return (True, user_info) when the jti was recently confirmed not revoked."""
+    with _cache_lock:
+        entry = _not_revoked_cache.get(jti)
+        if entry is None:
+            return None
+        expires_epoch, cached_until, user_info = entry
+        now = time.time()
+        if cached_until <= now or expires_epoch <= now:
+            _not_revoked_cache.pop(jti, None)
+            return None
+        return (True, user_info)
+
+
+# In-memory set of revoked jtis, loaded once from the DB and kept up to date
+# by revoke_current_token. The revoked set is tiny relative to the active set,
+# so an exact set costs little memory and gives an O(1) first-line check
+# (a Bloom filter would save a few bytes but then needs a DB double-check on
+# positives; with the exact set a hit is a definite 401).
+_revoked_jtis: set = set()
+_revoked_loaded = False
+
+
+async def _ensure_revoked_loaded(db: AsyncSession) -> None:
+    global _revoked_loaded
+    if _revoked_loaded:
+        return
+    result = await db.execute(select(models.Token.jti).where(models.Token.revoked.is_(True)))
+    jtis = result.scalars().all()
+    with _cache_lock:
+        _revoked_jtis.update(jtis)
+        _revoked_loaded = True
+
+async def get_or_create_user_by_email(db: AsyncSession, email: str) -> models.User:
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    user = result.scalar_one_or_none()
     if user:
-        user.last_login = datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(user)
+        # Rate-limit last_login writes: an UPDATE+COMMIT per login is an fsync
+        # on SQLite, and a minutes-stale value is fine for this field.
+        now = datetime.now(timezone.utc)
+        last = user.last_login
+        if last is not None and last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)  # naive SQLite value is UTC
+        if last is None or (now - last) > timedelta(minutes=5):
+            user.last_login = now
+            await db.commit()
         return user
 
-    # Create a new minimal user
+    # Create a new minimal user; no refresh needed — id is generated
+    # Python-side and every other column was just set here
     user = models.User(email=email, last_login=datetime.now(timezone.utc))
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user
 
-def create_access_token_db(
-    db: Session,
+def build_access_token(
     subject: str,
     user_id: Optional[str] = None,
     expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES,
-) -> str:
+) -> tuple:
+    """
+    Sign a JWT and return (token, row) where `row` holds the Token column
+    values still to be persisted. Issuance itself touches no DB.
+    """
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_minutes)
-    jti = uuid.uuid4().hex
+    # 32 hex chars like uuid4().hex, but a single os.urandom call with no
+    # version/variant bit-twiddling
+    jti = secrets.token_hex(16)
 
+    # minimal claim set: iat/nbf were never checked anywhere and just made
+    # every Authorization header ~30 bytes heavier
     payload = {
         "sub": subject,
-        "exp": expire,
-        "iat": now,
-        "nbf": now,
+        "exp": int(expire.timestamp()),
         "jti": jti,
     }
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-
-    # persist token record
-    db_token = models.Token(
-        jti=jti,
-        subject=subject,
-        user_id=user_id,
-        issued_at=now,
-        expires_at=expire,
-        revoked=False,
-        revoked_at=None,
-    )
-    db.add(db_token)
-    db.commit()
-    return token
+    token = jwt.encode(payload, _HMAC_KEY, algorithm=ALGORITHM)
+
+    row = {
+        "jti": jti,
+        "subject": subject,
+        "user_id": user_id,
+        "issued_at": now,
+        "expires_at": expire,
+        "revoked": False,
+        "revoked_at": None,
+    }
+    return token, row
+
+
+async def persist_token_record(row: Dict[str, Any]) -> None:
+    """Background task: write the issued token's row in its own session."""
+    async with SessionLocal() as db:
+        db.add(models.Token(**row))
+        await db.commit()
+
+
+def cache_fresh_token(row: Dict[str, Any], user_info: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Seed the not-revoked cache for a freshly issued token so requests that
+    race the background INSERT don't get a 401 before the row lands.
+    """
+    _remember_not_revoked(row["jti"], row["expires_at"].timestamp(), user_info)
 
 def decode_token(token: str) -> Dict[str, Any]:
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return jwt.decode(token, _HMAC_KEY, algorithms=[ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -81,10 +209,15 @@ def _as_aware_utc(dt: datetime) -> datetime:
         return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
 
-def require_active_token(
+async def require_active_token(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
+    h = _token_hash(token)
+    cached = _cached_auth(h)
+    if cached is not None:
+        return cached
+
     payload = decode_token(token)
     jti = payload.get("jti")
     if not jti:
@@ -94,31 +227,76 @@ def require_active_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    db_token = db.get(models.Token, jti)
-    if not db_token or db_token.revoked:
+    await _ensure_revoked_loaded(db)
+    if jti in _revoked_jtis:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token is revoked or invalid.",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    expires_at_aware = _as_aware_utc(db_token.expires_at)
-    now_aware = datetime.now(timezone.utc)
-    if expires_at_aware <= now_aware:
+    # Compare raw epoch floats instead of allocating datetimes: the JWT `exp`
+    # claim is already seconds-since-epoch and matches the DB expires_at.
+    now = time.time()
+    expires_epoch = payload.get("exp")
+    if expires_epoch is not None and expires_epoch <= now:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired.",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return payload
 
-def revoke_current_token(payload: Dict[str, Any], db: Session) -> None:
+    known = _known_not_revoked(jti)
+    if known is not None:
+        auth = {"payload": payload, "user": known[1]}
+        if expires_epoch is not None:
+            _cache_token(h, jti, auth, expires_epoch)
+        return auth
+
+    # narrow select instead of loading the whole ORM row: with the covering
+    # index this is an index-only lookup, no heap fetch
+    db_token = (
+        await db.execute(
+            select(models.Token.revoked, models.Token.expires_at, models.Token.user_id)
+            .where(models.Token.jti == jti)
+        )
+    ).first()
+    if not db_token or db_token.revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is revoked or invalid.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if expires_epoch is None:
+        # payload without exp: fall back to the persisted expiry
+        expires_epoch = _as_aware_utc(db_token.expires_at).timestamp()
+        if expires_epoch <= now:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has expired.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    # the subject claim is the user's email, so no users join is needed here
+    user_info = {"id": db_token.user_id, "email": payload.get("sub")}
+
+    auth = {"payload": payload, "user": user_info}
+    _cache_token(h, jti, auth, expires_epoch)
+    _remember_not_revoked(jti, expires_epoch, user_info)
+    return auth
+
+async def revoke_current_token(payload: Dict[str, Any], db: AsyncSession) -> None:
     jti = payload.get("jti")
     if not jti:
         return
-    db_token = db.get(models.Token, jti)
+    db_token = await db.get(models.Token, jti)
     if db_token and not db_token.revoked:
         db_token.revoked = True
         db_token.revoked_at = datetime.now(timezone.utc)
         db.add(db_token)
-        db.commit()
\ No newline at end of file
+        await db.commit()
+    _invalidate_cached_token(jti)
+    with _cache_lock:
+        _not_revoked_cache.pop(jti, None)
+        _revoked_jtis.add(jti)
\ No newline at end of file
@@ -1,9 +1,17 @@
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import dotenv
 import os
 
+# Tokens shared across PayPalAPI instances in the same process, keyed by
+# client_id, so multiple instances don't each re-authenticate.
+_token_cache = {}  # client_id -> (access_token, expires_epoch)
+_token_cache_lock = threading.Lock()
+
 
 class Invoice:
     def __init__(self, invoice_number, status, amount, currency, due_date):
@@ -26,11 +34,16 @@ class PayPalAPI:
         self.access_token = None
         self.access_token_expires_in = None
 
+        # keep-alive session: reuses TCP+TLS connections across PayPal calls
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+        self._lock = threading.Lock()
+
     def authenticate(self):
         """
         Authenticate with PayPal API and store access token and expiration
         """
-        response = requests.post(
+        response = self._session.post(
             url=f"{self.base_url}/v1/oauth2/token",
             auth=(self.client_id, self.client_secret),
             data={"grant_type": "client_credentials"},
@@ -42,14 +55,32 @@ class PayPalAPI:
         if response.status_code != 200:
             raise Exception("Failed to authenticate with PayPal API")
 
-        data = response.json()
+        data = orjson.loads(response.content)
         self.access_token = data.get("access_token")
         expires_in = data.get("expires_in", 0)
         self.access_token_expires_in = time.time() + expires_in - 60  # refresh 1 min before expiry
+        with _token_cache_lock:
+            _token_cache[self.client_id] = (self.access_token, self.access_token_expires_in)
+
+    def _token_expired(self):
+        return (
+            not self.access_token
+            or not self.access_token_expires_in
+            or time.time() >= self.access_token_expires_in
+        )
 
     def get_token(self):
-        if not self.access_token or not self.access_token_expires_in or time.time() >= self.access_token_expires_in:
-            self.authenticate()
+        if self._token_expired():
+            # another instance may already hold a fresh token for these creds
+            with _token_cache_lock:
+                cached = _token_cache.get(self.client_id)
+            if cached and time.time() < cached[1]:
+                self.access_token, self.access_token_expires_in = cached
+                return self.access_token
+            # double-checked lock so concurrent callers refresh only once
+            with self._lock:
+                if self._token_expired():
+                    self.authenticate()
         return self.access_token
 
     def get_invoices(self):
@@ -57,7 +88,7 @@ class PayPalAPI:
         Fetch a list of invoices from PayPal API
         """
         access_token = self.get_token()
-        invoices_response = requests.get(
+        invoices_response = self._session.get(
             f"{self.base_url}/v2/invoicing/invoices",
             headers={
                 "Content-Type": "application/json",
@@ -68,14 +99,15 @@ class PayPalAPI:
         if invoices_response.status_code != 200:
             raise Exception("Failed to fetch invoices from PayPal API")
 
-        return invoices_response.json().get("items", [])
+        # orjson parses straight from the response bytes, skipping the str decode
+        return orjson.loads(invoices_response.content).get("items", [])
 
     def create_invoice(self, invoice_data):
         """
         Create a new invoice in PayPal API
         """
         access_token = self.get_token()
-        create_response = requests.post(
+        create_response = self._session.post(
             f"{self.base_url}/v2/invoicing/invoices",
             json=invoice_data,
             headers={
@@ -88,8 +120,10 @@ class PayPalAPI:
         if create_response.status_code != 201:
             raise Exception(f"Failed to create invoice draft in PayPal API: {create_response.text}")
 
-        send_response = requests.post(
-            f"{self.base_url}/v2/invoicing/invoices/{create_response.json().get('id')}/send",
+        created = orjson.loads(create_response.content)
+
+        send_response = self._session.post(
+            f"{self.base_url}/v2/invoicing/invoices/{created.get('id')}/send",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {access_token}"
@@ -100,4 +134,4 @@ class PayPalAPI:
         if send_response.status_code != 200:
             raise Exception(f"Failed to send invoice in PayPal API: {send_response.text}")
 
-        return create_response.json()
+        return created
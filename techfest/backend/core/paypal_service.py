@@ -1,42 +1,50 @@
+import asyncio
 import os
 import json
 import openai
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
+# One async client for the whole process: connections are pooled across
+# requests and the event loop is free during the OpenAI round-trip.
+_OPENAI_CLIENT = openai.AsyncClient(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Config is static: parse it once at import instead of per PayPalService()
+with open(os.path.join(ROOT_DIR, 'config.json'), 'r') as f:
+    _CONFIG = json.load(f)
+
+_SYSTEM_PREFIX = (
+    {
+        'role': 'user',
+        'content': _CONFIG['prompts']['system_prompt']
+    },
+)
+
 
 class PayPalService:
 
     def __init__(self, paypal_api):
-        self.__load_config()
+        self.__config = _CONFIG
+        self._tools = _CONFIG['prompts']['tools']
 
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.openai_client = openai.Client(
-            api_key=self.openai_api_key
-        )
+        self.openai_client = _OPENAI_CLIENT
 
         self.paypal_api = paypal_api
 
-    def call_model(self, messages=[]):
+    async def call_model(self, messages=[]):
         """
         Handle user message and decide what actions to take
         """
 
-        messages = [
-            {
-                'role': 'user',
-                'content': self.__config['prompts']['system_prompt']
-            },
-            *messages
-        ]
+        messages = [*_SYSTEM_PREFIX, *messages]
 
         MAX_ITERATIONS = 4
         for _ in range(MAX_ITERATIONS):
 
-            response = self.openai_client.chat.completions.create(
+            response = await self.openai_client.chat.completions.create(
                 model="gpt-5-nano",
                 messages=messages,
-                tools=self.__config['prompts']['tools']
+                tools=self._tools
             )
 
             # print(f'\n\nResponse: {response}\n\n')
@@ -70,7 +78,8 @@ class PayPalService:
                     ]
                 })
 
-                tool_response = self.__call_tool(tool_name, tool_input)
+                # tools call PayPal via requests; keep the event loop free
+                tool_response = await asyncio.to_thread(self.__call_tool, tool_name, tool_input)
 
                 messages.append({
                     'role': 'tool',
@@ -92,7 +101,3 @@ class PayPalService:
                 return self.paypal_api.create_invoice(invoice_data)
             case _:
                 return f"Unknown tool: {tool_name}"
-
-    def __load_config(self):
-        with open(os.path.join(ROOT_DIR, 'config.json'), 'r') as f:
-            self.__config = json.load(f)
@@ -4,13 +4,15 @@ dotenv.load_dotenv()
 from typing import List, Dict
 
 from fastapi import FastAPI, Request, Response, HTTPException, Body, Query
+import asyncio
 import secrets
 import httpx
 # For securely signing/verifying state values
 from itsdangerous import URLSafeSerializer
-from fastapi import UploadFile, File, HTTPException, FastAPI, Depends, APIRouter
+from fastapi import UploadFile, File, HTTPException, FastAPI, Depends, APIRouter, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-import tempfile, os
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pydantic import BaseModel, EmailStr
 from fastapi.responses import FileResponse
 
@@ -19,12 +21,12 @@ from techfest.backend.core.paypal_service import PayPalService
 from techfest.backend.paypal_transactions.csv_export import ensure_csv
 from techfest.backend.paypal_transactions.invoicing import _list_unpaid_invoices
 from techfest.backend.paypal_transactions.recurring_api import RecurringResponse
-from techfest.backend.paypal_transactions.unpaid_invoices_api import UnpaidInvoicesResponse, _map_invoice_with_link
-from techfest.backend.text_speech.speech_to_text import transcribe_wav_file
+from techfest.backend.paypal_transactions.unpaid_invoices_api import UnpaidInvoicesResponse, _map_unpaid_invoices
+from techfest.backend.text_speech.speech_to_text import transcribe_wav_bytes
 from techfest.backend.text_speech.text_to_speech import text_to_mp3
 from techfest.backend.db import models
 from techfest.backend.db.database import engine, get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from techfest.backend.paypal_transactions.transactions import save_transactions
 from techfest.backend.paypal_transactions.auth import fetch_paypal_token, fetch_paypal_token_for_issuer
 from techfest.backend.paypal_transactions.notify import notify_same_day_last_month
@@ -34,17 +36,23 @@ from techfest.backend.paypal_transactions.notify import show_recurring_same_day_
 
 from techfest.backend.auth.jwt_auth import (
     require_active_token,
-    create_access_token_db,
+    build_access_token,
+    persist_token_record,
+    cache_fresh_token,
     revoke_current_token,
     get_or_create_user_by_email,
 )
 
 #run command for testing: uvicorn techfest.backend.main:app --reload
 
-models.Base.metadata.create_all(bind=engine)
-
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def init_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.create_all)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[os.getenv("CORS_ORIGIN", "http://localhost:8081")],
@@ -59,6 +67,10 @@ app.include_router(protected)
 paypal_api = PayPalAPI()
 paypal_service = PayPalService(paypal_api)
 
+# Audio work runs in worker processes so concurrent /stt + /tts requests
+# scale across cores instead of serializing on the GIL / default threadpool.
+_AUDIO_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
 class LoginRequest(BaseModel):
     email: EmailStr
 
@@ -174,26 +186,28 @@ async def exchange_refresh_token(refresh_token: str = Body(..., embed=True)):
 
 
 @app.post("/login", response_model=TokenResponse)
-def login(req: LoginRequest, db: Session = Depends(get_db)):
+async def login(req: LoginRequest, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """
     Accepts an already verified email from a third-party identity provider.
     Stores only the email, issues an API access token, and persists token status in DB.
     """
-    user = get_or_create_user_by_email(db, req.email)
-    jwt_token = create_access_token_db(db, subject=user.email, user_id=user.id)
+    user = await get_or_create_user_by_email(db, req.email)
+    jwt_token, token_row = build_access_token(subject=user.email, user_id=user.id)
+    # respond without waiting for the INSERT; the cache covers the race window
+    cache_fresh_token(token_row, {"id": user.id, "email": user.email})
+    background_tasks.add_task(persist_token_record, token_row)
     return TokenResponse(access_token=jwt_token)
 
 @app.post("/logout")
-def logout(payload: dict = Depends(require_active_token), db: Session = Depends(get_db)):
-    revoke_current_token(payload, db)
+async def logout(auth: dict = Depends(require_active_token), db: AsyncSession = Depends(get_db)):
+    await revoke_current_token(auth["payload"], db)
     return {"status": "logged_out"}
 
 # Optional: protected demo route
 @app.get("/me")
-def me(payload: dict = Depends(require_active_token), db: Session = Depends(get_db)):
-    email = payload.get("sub")
-    user = db.query(models.User).filter(models.User.email == email).first()
-    return {"user": {"email": email}}
+async def me(auth: dict = Depends(require_active_token)):
+    # the auth dependency already fetched the user alongside the token
+    return {"user": {"email": auth["user"]["email"]}}
 
 @app.post("/stt")
 async def stt(file: UploadFile = File(...), payload: dict = Depends(require_active_token)):
@@ -201,31 +215,23 @@ async def stt(file: UploadFile = File(...), payload: dict = Depends(require_acti
     Receives a .wav file from the frontend and returns a JSON { "text": "<transcript>" }.
     Requires login (Bearer token).
     """
-    if file.content_type not in {"audio/wav", "audio/x-wav", "audio/wave"}:
-        raise HTTPException(status_code=400, detail="Please upload a WAV file.")
-
-    tmp_path = None
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
-            contents = await file.read()
-            if not contents:
-                raise HTTPException(status_code=400, detail="Uploaded file is empty.")
-            tmp.write(contents)
-
-        text = transcribe_wav_file(tmp_path)
+        contents = await file.read()
+        if not contents:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+        # check the WAV magic bytes rather than trusting content_type
+        if contents[:4] != b"RIFF":
+            raise HTTPException(status_code=400, detail="Please upload a WAV file.")
+
+        # hand the bytes straight to the transcriber — no tempfile, no disk I/O
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(_AUDIO_POOL, transcribe_wav_bytes, contents)
         return {"text": text}
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
 
 class TTSRequest(BaseModel):
     text: str
@@ -233,51 +239,63 @@ class TTSRequest(BaseModel):
     download: bool = False
 
 @app.post("/tts")
-def tts(req: TTSRequest, payload: dict = Depends(require_active_token)):
+async def tts(req: TTSRequest, payload: dict = Depends(require_active_token)):
     """
-    Receives text and returns an MP3 file as the response body.
+    Receives text and returns an audio file as the response body
+    (MP3 via gTTS, or WAV when the local Piper voice is configured).
     """
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Text is required.")
 
     try:
-        path, name = text_to_mp3(req.text.strip(), req.filename)
+        loop = asyncio.get_running_loop()
+        path, name = await loop.run_in_executor(_AUDIO_POOL, text_to_mp3, req.text.strip(), req.filename)
         disposition = "attachment" if req.download else "inline"
         headers = {"Content-Disposition": f'{disposition}; filename="{name}"'}
-        # Return the actual MP3 file
-        return FileResponse(path, media_type="audio/mpeg", headers=headers)
+        # Return the actual audio file, typed by what the synthesizer produced
+        media_type = "audio/wav" if name.lower().endswith(".wav") else "audio/mpeg"
+        return FileResponse(path, media_type=media_type, headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS error: {e}")
 
 
 
-@app.get("/unpaid-invoices", response_model=UnpaidInvoicesResponse)
-def get_unpaid_invoices(page_size: int = 50, page: int = 1, payload: dict = Depends(require_active_token)):
+async def _unpaid_invoices_impl(page_size: int = 50, page: int = 1) -> UnpaidInvoicesResponse:
     """
-    Returns unpaid/sent invoices for the ISSUING business (sandbox/live per PAYPAL_ENV),
-    including a ready-to-use pay_url for each invoice.
+    Shared implementation for both unpaid-invoice endpoints so the notify
+    variant doesn't re-enter the route function (and its token fetch).
     """
     try:
-        token = fetch_paypal_token_for_issuer()
+        token = await asyncio.to_thread(fetch_paypal_token_for_issuer)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch issuer token: {e}")
 
     try:
-        data = _list_unpaid_invoices(token, page=page, page_size=page_size)
+        data = await asyncio.to_thread(_list_unpaid_invoices, token, page, page_size)
         items = data.get("items") or []
-        mapped = [_map_invoice_with_link(token, it) for it in items]
+        # prefetches each detail once, concurrently, then maps locally
+        mapped = await asyncio.to_thread(_map_unpaid_invoices, token, items)
         return UnpaidInvoicesResponse(count=len(mapped), items=mapped)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to list unpaid invoices: {e}")
 
 
+@app.get("/unpaid-invoices", response_model=UnpaidInvoicesResponse)
+async def get_unpaid_invoices(page_size: int = 50, page: int = 1, payload: dict = Depends(require_active_token)):
+    """
+    Returns unpaid/sent invoices for the ISSUING business (sandbox/live per PAYPAL_ENV),
+    including a ready-to-use pay_url for each invoice.
+    """
+    return await _unpaid_invoices_impl(page_size=page_size, page=page)
+
+
 @app.post("/unpaid-invoices/notify", response_model=UnpaidInvoicesResponse)
-def notify_unpaid_invoices(payload: dict = Depends(require_active_token)):
+async def notify_unpaid_invoices(payload: dict = Depends(require_active_token)):
     """
     'Notification' variant – same payload as GET but intended to be called by a scheduler.
     You can wire a real notifier (email/Slack) here later.
     """
-    resp = get_unpaid_invoices()
+    resp = await _unpaid_invoices_impl()
     if resp.count == 0:
         # replace with your notifier of choice
         print("No unpaid/sent invoices found.")
@@ -335,8 +353,8 @@ def notify_recurring_same_day(
         raise HTTPException(status_code=500, detail=f"Failed to compute recurring payments: {e}")
 
 @app.post('/chat')
-def chat(messages: List[Dict] = Body(...)):
+async def chat(messages: List[Dict] = Body(...)):
 
     print(f"Received messages: {messages}")
-    res = paypal_service.call_model(messages)
+    res = await paypal_service.call_model(messages)
     return {"reply": res}
\ No newline at end of file
@@ -1,6 +1,8 @@
 import base64
 import logging
 import os
+import threading
+import time
 
 import httpx
 
@@ -10,10 +12,39 @@ client_id = os.getenv("CLIENT_ID", "AUwDbh92cYpOxREvA3aeugMEfJdMH5U-HwMvLi0z-ABQ
 
 log = logging.getLogger("paypalx.auth")
 
+# PayPal access tokens live for hours, so re-authenticating per call wastes a
+# full HTTPS round-trip. Cache (token, deadline) per credential pair and reuse
+# until ~60 s before expiry. Deadlines use time.monotonic() so a wall-clock
+# jump (NTP step, suspend/resume) can't make a stale token look fresh.
+_token_cache = {}  # (client_id, secret) -> (token, monotonic_deadline)
+_token_lock = threading.Lock()
+
+
+def _cached_token(key) -> str:
+    with _token_lock:
+        tok, deadline = _token_cache.get(key, (None, 0.0))
+    if tok and time.monotonic() < deadline:
+        return tok
+    return None
+
+
+def _store_token(key, token: str, expires_in) -> None:
+    try:
+        ttl = float(expires_in)
+    except (TypeError, ValueError):
+        ttl = 0.0
+    if ttl > 0:
+        with _token_lock:
+            _token_cache[key] = (token, time.monotonic() + ttl - 60)
+
+
 def fetch_paypal_token() -> str:
     client_id = os.getenv("CLIENT_ID", "AUwDbh92cYpOxREvA3aeugMEfJdMH5U-HwMvLi0z-ABQQ0puDUd1ijGzFsh6s7ugl2zisrqI4tZGYRAT")
     secret = os.getenv("CLIENT_SECRET","EL9UjcK_RLn94hX6HaDKhGfLXPh4L-_RAU-kUtVJZdlQGRbT2re1iiTTjFccDKczOjUZjLyAKUckTERG")
 
+    cached = _cached_token((client_id, secret))
+    if cached:
+        return cached
 
     base_url = paypal_base_url()
     basic = base64.b64encode(f"{client_id}:{secret}".encode("utf-8")).decode("ascii")
@@ -36,6 +67,7 @@ def fetch_paypal_token() -> str:
             if not token:
                 log.error("No access_token found in OAuth response.")
                 raise SystemExit(4)
+            _store_token((client_id, secret), token, data.get("expires_in"))
             return token
     except httpx.HTTPStatusError as e:
         log.error("PayPal OAuth failed (%s): %s", e.response.status_code, e.response.text)
@@ -52,14 +84,15 @@ from .config import paypal_base_url
 
 log = logging.getLogger("paypalx.auth")
 
-def fetch_paypal_token_for_issuer() -> str:
+def fetch_paypal_token_for(client_id: str, secret: str) -> str:
     """
-    Get an OAuth token using explicit credentials (for a *different* business).
+    Get an OAuth token for explicit credentials (any business), going through
+    the same per-credential cache as the env-configured fetchers.
     Uses the same PAYPAL_ENV as your app (sandbox/live).
     """
-
-    client_id = require_env("ISSUER_CLIENT_ID")
-    secret = require_env("ISSUER_CLIENT_SECRET")
+    cached = _cached_token((client_id, secret))
+    if cached:
+        return cached
 
     base_url = paypal_base_url()
     basic = base64.b64encode(f"{client_id}:{secret}".encode("utf-8")).decode("ascii")
@@ -77,4 +110,14 @@ def fetch_paypal_token_for_issuer() -> str:
         token = data.get("access_token")
         if not token:
             raise RuntimeError("No access_token in OAuth response for issuer business.")
-        return token
\ No newline at end of file
+        _store_token((client_id, secret), token, data.get("expires_in"))
+        return token
+
+
+def fetch_paypal_token_for_issuer() -> str:
+    """
+    Get an OAuth token using explicit credentials (for a *different* business).
+    Uses the same PAYPAL_ENV as your app (sandbox/live).
+    """
+    return fetch_paypal_token_for(require_env("ISSUER_CLIENT_ID"),
+                                  require_env("ISSUER_CLIENT_SECRET"))
\ No newline at end of file
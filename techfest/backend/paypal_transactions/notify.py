@@ -1,9 +1,13 @@
 # paypalx/notify.py
 import csv
 import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone, date
+from functools import lru_cache
 from typing import Dict, Optional, Tuple, List
 from techfest.backend.paypal_transactions.auth import fetch_paypal_token_for_issuer
+from techfest.backend.paypal_transactions.csv_export import FIELDS
 from techfest.backend.paypal_transactions.invoicing import _list_unpaid_invoices, build_pay_link_for_invoice, \
     _pick_latest_invoice_id
 
@@ -11,6 +15,7 @@ from techfest.backend.paypal_transactions.invoicing import _list_unpaid_invoices
 def _norm(s: str) -> str:
     return s.strip().lower().replace(" ", "_")
 
+@lru_cache(maxsize=4096)
 def _parse_iso8601_utc(s: str) -> Optional[datetime]:
     if not s:
         return None
@@ -29,6 +34,28 @@ def _columns_map(header) -> Dict[str, str]:
     """Map normalized names to actual CSV columns."""
     return {_norm(h): h for h in header}
 
+# Parsed-CSV cache keyed by (path, mtime): both notify flows read the same
+# export, so a session running both parses the file once. A regeneration by
+# ensure_csv bumps the mtime and invalidates the entry automatically.
+_CSV_CACHE: Dict[tuple, tuple] = {}
+
+def _load_csv_cached(path: str) -> Tuple[List[str], List[List[str]], Dict[str, str]]:
+    # csv.reader keeps rows as plain lists — DictReader allocates and hashes
+    # a dict per row, which dominates for a narrow 10-column file. The few
+    # rows that actually match a target date get dict-ified at the call site.
+    key = (path, os.path.getmtime(path))
+    hit = _CSV_CACHE.get(key)
+    if hit is not None:
+        return hit
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        rows = list(reader)
+    cols_map = _columns_map(header)
+    _CSV_CACHE.clear()  # keep at most the current file
+    _CSV_CACHE[key] = (header, rows, cols_map)
+    return header, rows, cols_map
+
 def _pick(cols_map: Dict[str, str], candidates) -> Optional[str]:
     for c in candidates:
         if c in cols_map:
@@ -71,30 +98,37 @@ def notify_same_day_last_month(csv_path: str) -> Tuple[str, Optional[Dict]]:
     if not os.path.exists(csv_path):
         return ("No recurring payment (CSV not found).", None)
 
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        if not rows:
-            return ("No recurring payment (CSV empty).", None)
-        cols_map = _columns_map(reader.fieldnames)
-
-    time_col = _pick(cols_map, ["initiation_time","time","transaction_time","transaction_initiation_date"])
-    desc_col = _pick(cols_map, ["description","item_names","transaction_subject","note","memo"])
-    payer_col= _pick(cols_map, ["sender_name","payer_email","payer_name","payer"])
-    val_col  = _pick(cols_map, ["amount_value","amount","transaction_amount_value","value"])
-    ccy_col  = _pick(cols_map, ["amount_currency","currency","transaction_amount_currency","currency_code"])
+    header, rows, cols_map = _load_csv_cached(csv_path)
+    if not rows:
+        return ("No recurring payment (CSV empty).", None)
+
+    if list(cols_map) == FIELDS:
+        # our own export schema: skip the header guessing entirely
+        # (cols_map resolves the normalized names back to the raw header)
+        time_col, desc_col, payer_col, val_col, ccy_col = (
+            cols_map["transaction_initiation_date"], cols_map["description"],
+            cols_map["sender_name"], cols_map["amount_value"],
+            cols_map["amount_currency"],
+        )
+    else:
+        time_col = _pick(cols_map, ["initiation_time","time","transaction_time","transaction_initiation_date"])
+        desc_col = _pick(cols_map, ["description","item_names","transaction_subject","note","memo"])
+        payer_col= _pick(cols_map, ["sender_name","payer_email","payer_name","payer"])
+        val_col  = _pick(cols_map, ["amount_value","amount","transaction_amount_value","value"])
+        ccy_col  = _pick(cols_map, ["amount_currency","currency","transaction_amount_currency","currency_code"])
 
     if not time_col:
         return ("No recurring payment (no timestamp column).", None)
 
     target_date = _last_month_same_day_or_prev_friday(datetime.now(timezone.utc))
+    time_i = header.index(time_col)
 
-    # collect candidates for that target date
-    candidates = []
-    for r in rows:
-        ts = _parse_iso8601_utc(r.get(time_col, ""))
-        if ts and ts.date() == target_date:
-            candidates.append((ts, r))
+    # bulk-parse the timestamp column once instead of fromisoformat per row;
+    # only the matched rows (usually one) are dict-ified for the caller
+    ts = pd.to_datetime(pd.Series((r[time_i] if time_i < len(r) else "") for r in rows),
+                        utc=True, errors="coerce")
+    mask = ts.dt.date == target_date
+    candidates = [(ts[i].to_pydatetime(), dict(zip(header, rows[i]))) for i in mask[mask].index]
 
     if not candidates:
         return ("No recurring payment", None)
@@ -145,20 +179,18 @@ def _same_day_k_months_ago_or_prev_friday(today_utc: datetime, k: int) -> date:
         target -= timedelta(days=1)
     return target
 
+# label per (has1, has2, has3) combination; unlisted combinations are irregular
+_PATTERN = {
+    (True, False, False): "recurring: last month only",
+    (True, True, False): "recurring: last 2 months",
+    (True, True, True): "recurring: last 3 months",
+    (False, True, False): "recurring: 2 months ago only",
+    (False, False, True): "recurring: 3 months ago only",
+    (False, True, True): "recurring: skipped last month (2–3 months ago)",
+}
+
 def _classify(has1: bool, has2: bool, has3: bool) -> str:
-    if has1 and not has2 and not has3:
-        return "recurring: last month only"
-    if has1 and has2 and not has3:
-        return "recurring: last 2 months"
-    if has1 and has2 and has3:
-        return "recurring: last 3 months"
-    if not has1 and has2 and not has3:
-        return "recurring: 2 months ago only"
-    if not has1 and not has2 and has3:
-        return "recurring: 3 months ago only"
-    if not has1 and has2 and has3:
-        return "recurring: skipped last month (2–3 months ago)"
-    return "recurring: irregular pattern"
+    return _PATTERN.get((has1, has2, has3), "recurring: irregular pattern")
 
 # --- main detection & display ---
 def show_recurring_same_day_last_3_months(csv_path: str) -> List[Dict]:
@@ -170,21 +202,27 @@ def show_recurring_same_day_last_3_months(csv_path: str) -> List[Dict]:
         print("No recurring payment (CSV not found).")
         return []
 
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        if not rows:
-            print("No recurring payment (CSV empty).")
-            return []
-        cols_map = _columns_map(reader.fieldnames)
-
-    # Column guesses (robust to different headers)
-    time_col = _pick(cols_map, ["initiation_time","time","transaction_time","transaction_initiation_date"])
-    desc_col = _pick(cols_map, ["description","item_names","transaction_subject","note","memo"])
-    inv_col  = _pick(cols_map, ["invoice_id","cart_invoice_id","paypal_invoice_id"])
-    payer_col= _pick(cols_map, ["sender_name","payer_email","payer_name","payer"])
-    val_col  = _pick(cols_map, ["amount_value","amount","transaction_amount_value","value"])
-    ccy_col  = _pick(cols_map, ["amount_currency","currency","transaction_amount_currency","currency_code"])
+    header, rows, cols_map = _load_csv_cached(csv_path)
+    if not rows:
+        print("No recurring payment (CSV empty).")
+        return []
+
+    if list(cols_map) == FIELDS:
+        # our own export schema: skip the header guessing entirely
+        # (cols_map resolves the normalized names back to the raw header)
+        time_col, desc_col, inv_col, payer_col, val_col, ccy_col = (
+            cols_map["transaction_initiation_date"], cols_map["description"],
+            cols_map["invoice_id"], cols_map["sender_name"],
+            cols_map["amount_value"], cols_map["amount_currency"],
+        )
+    else:
+        # Column guesses (robust to different headers)
+        time_col = _pick(cols_map, ["initiation_time","time","transaction_time","transaction_initiation_date"])
+        desc_col = _pick(cols_map, ["description","item_names","transaction_subject","note","memo"])
+        inv_col  = _pick(cols_map, ["invoice_id","cart_invoice_id","paypal_invoice_id"])
+        payer_col= _pick(cols_map, ["sender_name","payer_email","payer_name","payer"])
+        val_col  = _pick(cols_map, ["amount_value","amount","transaction_amount_value","value"])
+        ccy_col  = _pick(cols_map, ["amount_currency","currency","transaction_amount_currency","currency_code"])
 
     if not time_col:
         print("No recurring payment (no timestamp column).")
@@ -206,15 +244,23 @@ def show_recurring_same_day_last_3_months(csv_path: str) -> List[Dict]:
     # presence[k][key] = list of rows on target date k months ago
     presence: Dict[int, Dict[str, List[Dict]]] = {1:{}, 2:{}, 3:{}}
 
+    # ISO-8601 starts with YYYY-MM-DD, so the date prefix alone both filters
+    # the row and picks its month bucket — one dict lookup per row, no
+    # datetime construction at all. Rows are plain lists here; only the few
+    # matches get dict-ified for the result payload.
+    prefix_to_k = {t.isoformat(): k for k, t in targets.items()}
+    time_i = header.index(time_col)
+    key_i = header.index(key_choice) if key_choice else None
     for r in rows:
-        ts = _parse_iso8601_utc(r.get(time_col, ""))
-        if not ts:
+        ts_raw = r[time_i] if time_i < len(r) else ""
+        k = prefix_to_k.get(ts_raw[:10])
+        if k is None:
             continue
-        r_date = ts.date()
-        for k, tgt in targets.items():
-            if r_date == tgt:
-                gkey = _norm_key(r.get(key_choice)) if key_choice else "__all__"
-                presence[k].setdefault(gkey, []).append(r)
+        if key_i is not None:
+            gkey = _norm_key(r[key_i] if key_i < len(r) else None)
+        else:
+            gkey = "__all__"
+        presence[k].setdefault(gkey, []).append(dict(zip(header, r)))
 
     all_keys = set(presence[1].keys()) | set(presence[2].keys()) | set(presence[3].keys())
     if not all_keys:
@@ -276,28 +322,43 @@ def unpaid_invoice_notification():
     page_size = 50
     total_found = 0
 
-    while True:
+    # One pool for both the per-invoice link builds and the page prefetch;
+    # threads share the pooled invoicing session.
+    with ThreadPoolExecutor(max_workers=16) as pool:
         data = _list_unpaid_invoices(token, page=page, page_size=page_size)
-        items = data.get("items") or []
-
-        if page == 1 and not items:
-            print("No unpaid/sent invoices found.")
-            return
-        print("Here are your unpaid/sent invoices with payment links:")
-        for it in items:
-            inv_id = it.get("id")
-                # Build/ensure a payer link using your existing helper
-            used_id, pay_url = build_pay_link_for_invoice(token, inv_id)
+        while True:
+            items = data.get("items") or []
+
+            if page == 1 and not items:
+                print("No unpaid/sent invoices found.")
+                return
+
+            # Kick off the next page fetch before processing this one so the
+            # network round-trip overlaps the link building below.
+            next_future = None
+            if len(items) >= page_size:
+                next_future = pool.submit(_list_unpaid_invoices, token, page + 1, page_size)
+
+            print("Here are your unpaid/sent invoices with payment links:")
+            # Each link build is 1-3 independent HTTPS round-trips, so overlap them
+            futures = {
+                pool.submit(build_pay_link_for_invoice, token, it.get("id")): it
+                for it in items
+            }
+            for fut in as_completed(futures):
+                it = futures[fut]
+                used_id, pay_url = fut.result()
                 # Try to show a nicer label if available
-            detail = (it.get("detail") or {})
-            number = detail.get("invoice_number") or used_id
-            print(f"- {number}: {pay_url or '(no payer link yet)'}")
-            total_found += 1
+                detail = (it.get("detail") or {})
+                number = detail.get("invoice_number") or used_id
+                print(f"- {number}: {pay_url or '(no payer link yet)'}")
+                total_found += 1
 
             # Simple pagination: stop if fewer than page_size returned
-        if len(items) < page_size:
-            break
-        page += 1
+            if next_future is None:
+                break
+            data = next_future.result()
+            page += 1
 
     if total_found == 0:
         print("No unpaid/sent invoices found.")
\ No newline at end of file
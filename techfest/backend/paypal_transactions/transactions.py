@@ -1,10 +1,19 @@
+import asyncio
 import logging
-from typing import Dict, Generator, Iterable, Tuple
+from typing import Dict, Generator, Iterable, List, Tuple
 from datetime import datetime, timedelta, timezone
-import requests
+import httpx
+import orjson
 from .config import paypal_base_url
 from .auth import fetch_paypal_token
-from .storage import ingest_to_sqlite, export_csv, DB_PATH_DEFAULT
+from .storage import (
+    DB_PATH_DEFAULT,
+    export_csv,
+    flush_ingest_db,
+    ingest_page,
+    ingest_to_sqlite,
+    open_ingest_db,
+)
 
 log = logging.getLogger("paypalx.transactions")
 
@@ -13,7 +22,9 @@ def _iso(ts: datetime) -> str:
         ts = ts.replace(tzinfo=timezone.utc)
     else:
         ts = ts.astimezone(timezone.utc)
-    return ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+    # direct f-string formatting skips strftime's locale machinery
+    return (f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}"
+            f"T{ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}Z")
 
 def _chunked_windows(start: datetime, end: datetime, max_days: int = 31
                     ) -> Generator[Tuple[str, str], None, None]:
@@ -25,7 +36,8 @@ def _chunked_windows(start: datetime, end: datetime, max_days: int = 31
         yield _iso(cursor), _iso(nxt)
         cursor = nxt
 
-def _request_transactions_page(
+async def _request_transactions_page(
+    client: httpx.AsyncClient,
     access_token: str,
     start_iso: str,
     end_iso: str,
@@ -46,47 +58,109 @@ def _request_transactions_page(
         "balance_affecting_records_only": "Y" if balance_affecting_only else "N",
     }
     base_url = paypal_base_url()
-    resp = requests.get(f"{base_url}/v1/reporting/transactions",
-                        headers=headers, params=params, timeout=40)
+    resp = await client.get(f"{base_url}/v1/reporting/transactions",
+                            headers=headers, params=params)
     if resp.status_code >= 400:
         try:
             log.error("Transactions API %s: %s", resp.status_code, resp.json())
         except Exception:
             log.error("Transactions API %s: %s", resp.status_code, resp.text)
         resp.raise_for_status()
-    return resp.json()
+    # orjson beats resp.json() on these 500-row reporting pages
+    return orjson.loads(resp.content)
 
-def fetch_transactions(
+async def _fetch_window_pages(
+    client: httpx.AsyncClient,
+    access_token: str,
+    start_iso: str,
+    end_iso: str,
+    page_size: int,
+    balance_affecting_only: bool,
+) -> List[Dict]:
+    """Page 1 reports total_pages, so pages 2..N can be fetched concurrently."""
+    first = await _request_transactions_page(
+        client, access_token, start_iso, end_iso, 1,
+        page_size=page_size, balance_affecting_only=balance_affecting_only,
+    )
+    pages = [first]
+    total_pages = first.get("total_pages")
+    if total_pages is not None:
+        if int(total_pages) > 1:
+            pages.extend(await asyncio.gather(*(
+                _request_transactions_page(
+                    client, access_token, start_iso, end_iso, p,
+                    page_size=page_size, balance_affecting_only=balance_affecting_only,
+                )
+                for p in range(2, int(total_pages) + 1)
+            )))
+        return pages
+
+    # no total_pages in the response: fall back to serial link-following
+    data = first
+    page = 1
+    while True:
+        links = {lk.get("rel"): lk.get("href") for lk in data.get("links", [])}
+        if "next" not in links:
+            break
+        page += 1
+        data = await _request_transactions_page(
+            client, access_token, start_iso, end_iso, page,
+            page_size=page_size, balance_affecting_only=balance_affecting_only,
+        )
+        pages.append(data)
+    return pages
+
+async def _fetch_one_window(
+    start_iso: str,
+    end_iso: str,
+    access_token: str,
+    page_size: int,
+    balance_affecting_only: bool,
+) -> List[Dict]:
+    limits = httpx.Limits(max_connections=8)
+    async with httpx.AsyncClient(http2=True, limits=limits, timeout=40.0) as client:
+        return await _fetch_window_pages(
+            client, access_token, start_iso, end_iso,
+            page_size, balance_affecting_only,
+        )
+
+def fetch_transaction_pages(
     start_dt: datetime,
     end_dt: datetime,
     access_token: str,
     page_size: int = 500,
     balance_affecting_only: bool = True,
 ) -> Iterable[Dict]:
+    """
+    Yield raw Transaction Search pages (31-day chunking + pagination).
+    Within each window, pages after the first are fetched concurrently over
+    one multiplexed HTTP/2 connection; results come back in page order.
+    Windows are fetched one at a time so callers can stream each window's
+    pages to disk before the next window is requested — at most one window
+    of pages is ever held in memory (the per-window client setup is ~3
+    handshakes across a 90-day range).
+    """
     if start_dt >= end_dt:
         return
     for start_iso, end_iso in _chunked_windows(start_dt, end_dt, max_days=31):
-        page = 1
-        while True:
-            data = _request_transactions_page(
-                access_token, start_iso, end_iso, page,
-                page_size=page_size,
-                balance_affecting_only=balance_affecting_only,
-            )
-            for txn in data.get("transaction_details", []) or []:
-                yield txn
-
-            total_pages = data.get("total_pages")
-            if total_pages is not None:
-                if page >= int(total_pages):
-                    break
-                page += 1
-            else:
-                links = {lk.get("rel"): lk.get("href") for lk in data.get("links", [])}
-                if "next" in links:
-                    page += 1
-                    continue
-                break
+        yield from asyncio.run(_fetch_one_window(
+            start_iso, end_iso, access_token, page_size, balance_affecting_only,
+        ))
+
+def fetch_transactions(
+    start_dt: datetime,
+    end_dt: datetime,
+    access_token: str,
+    page_size: int = 500,
+    balance_affecting_only: bool = True,
+) -> Iterable[Dict]:
+    for data in fetch_transaction_pages(
+        start_dt, end_dt, access_token,
+        page_size=page_size,
+        balance_affecting_only=balance_affecting_only,
+    ):
+        for txn in data.get("transaction_details", []) or []:
+            yield txn
 
 def print_transaction_summary(txn: Dict) -> None:
     info = txn.get("transaction_info", {}) or {}
@@ -118,17 +192,24 @@ def save_transactions(token):
 
 
 
-    # Fetch iterator
-    txns_iter = fetch_transactions(
-        start_dt=start_time,
-        end_dt=end_time,
-        access_token=token,
-        page_size=500,
-        balance_affecting_only=True,
-    )
-
-    # Ingest into a fresh SQLite (scoped to this 90d window), then export CSV
-    rows = ingest_to_sqlite(txns_iter, db_path=DB_PATH_DEFAULT)
+    # Ingest page-by-page into a fresh in-memory SQLite (scoped to this 90d
+    # window): each HTTP page goes straight to executemany without the
+    # one-txn-at-a-time generator hop, then snapshot to disk and export CSV
+    conn = open_ingest_db()
+    rows = 0
+    try:
+        for page_json in fetch_transaction_pages(
+            start_dt=start_time,
+            end_dt=end_time,
+            access_token=token,
+            page_size=500,
+            balance_affecting_only=True,
+        ):
+            rows += ingest_page(conn, page_json)
+        conn.commit()
+        flush_ingest_db(conn, DB_PATH_DEFAULT)
+    finally:
+        conn.close()
     log.info("Ingested/updated %d transactions into %s", rows, DB_PATH_DEFAULT)
 
     exported = export_csv(DB_PATH_DEFAULT, OUTPUT_CSV)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -6,6 +7,7 @@ from pydantic import BaseModel
 from techfest.backend.paypal_transactions.auth import fetch_paypal_token_for_issuer
 from techfest.backend.paypal_transactions.invoicing import (
     _list_unpaid_invoices,
+    build_pay_link_from_detail,
     build_pay_link_for_invoice,
     show_invoice,
 )
@@ -45,7 +47,7 @@ def _recipient_from_item(it: dict) -> Recipient:
     return Recipient(name=(full_name or None), email=billing.get("email_address"))
 
 
-def _map_invoice_with_link(token: str, it: dict) -> UnpaidInvoice:
+def _map_invoice_with_link(token: str, it: dict, prefetched: Optional[tuple] = None) -> UnpaidInvoice:
     inv_id = it.get("id")
     detail = (it.get("detail") or {})
     number = detail.get("invoice_number") or inv_id
@@ -53,15 +55,17 @@ def _map_invoice_with_link(token: str, it: dict) -> UnpaidInvoice:
     amount = (detail.get("amount") or {})  # sometimes present if you asked for fields; otherwise skip
     note_memo = detail.get("note") or detail.get("memo")
 
-    used_id, pay_url = build_pay_link_for_invoice(token, inv_id)
-    # enrich (optional) by refetching full invoice to read description if missing
+    # one show_invoice payload feeds both the pay link and the memo — the
+    # old flow fetched the invoice inside build_pay_link_for_invoice and then
+    # refetched it just to read the description
+    if prefetched is None:
+        prefetched = show_invoice(token, inv_id)
+    inv_json, view_url, _ = prefetched
+    used_id, pay_url = build_pay_link_from_detail(token, inv_id, inv_json, view_url)
+
     if not note_memo:
-        try:
-            inv_json, _, _ = show_invoice(token, inv_id)
-            d2 = (inv_json.get("detail") or {})
-            note_memo = d2.get("note") or d2.get("memo")
-        except Exception:
-            pass
+        d2 = (inv_json.get("detail") or {})
+        note_memo = d2.get("note") or d2.get("memo")
 
     return UnpaidInvoice(
         id=used_id,
@@ -73,3 +77,12 @@ def _map_invoice_with_link(token: str, it: dict) -> UnpaidInvoice:
         recipient=_recipient_from_item(it),
         pay_url=pay_url,
     )
+
+
+def _map_unpaid_invoices(token: str, items: List[dict]) -> List[UnpaidInvoice]:
+    """Fetch every invoice's detail once, concurrently, then map locally."""
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        details = list(pool.map(lambda it: show_invoice(token, it.get("id")), items))
+    return [_map_invoice_with_link(token, it, prefetched=d) for it, d in zip(items, details)]
@@ -1,17 +1,99 @@
-from openai import OpenAI
+import asyncio
+import hashlib
+import io
+from collections import OrderedDict
+from typing import List
 
-client = OpenAI()
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
-def transcribe_wav_file(local_wav_path: str) -> str:
+# Hand the SDK explicit httpx clients so every transcription reuses one
+# pooled HTTP/2 connection — without this, some SDK versions open (and TLS-
+# handshake) a fresh connection per call, which dominates short uploads.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=8)
+client = OpenAI(http_client=httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=60))
+_async_client = AsyncOpenAI(http_client=httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=60))
+
+# identical audio (retries, repeated uploads) shouldn't hit Whisper twice:
+# small LRU keyed by a blake2b digest of the raw bytes
+_CACHE_MAX = 256
+_transcript_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# bound concurrent Whisper uploads for the batch helper
+_TRANSCRIBE_CONCURRENCY = 8
+
+def _audio_key(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _cache_get(key: str):
+    text = _transcript_cache.get(key)
+    if text is not None:
+        _transcript_cache.move_to_end(key)
+    return text
+
+def _cache_put(key: str, text: str) -> None:
+    _transcript_cache[key] = text
+    if len(_transcript_cache) > _CACHE_MAX:
+        _transcript_cache.popitem(last=False)
+
+def _wav_buffer(data: bytes) -> io.BytesIO:
+    buf = io.BytesIO(data)
+    buf.name = "audio.wav"  # the SDK infers the format from the name
+    return buf
+
+def transcribe_wav_bytes(data: bytes) -> str:
     """
-    Takes the path to a local .wav file and returns the transcription string.
+    Takes raw WAV bytes and returns the transcription string.
+    Avoids any tempfile round-trip — the upload goes straight to the API.
     """
+    key = _audio_key(data)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    try:
+        result = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=_wav_buffer(data)
+        )
+    except Exception as e:
+        raise RuntimeError(f"Transcription failed: {e}")
+    _cache_put(key, result.text)
+    return result.text
+
+async def transcribe_wav_bytes_async(data: bytes) -> str:
+    """Async variant of transcribe_wav_bytes, sharing the same cache."""
+    key = _audio_key(data)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
     try:
-        with open(local_wav_path, "rb") as f:
-            result = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=f
-            )
-        return result.text
+        result = await _async_client.audio.transcriptions.create(
+            model="whisper-1",
+            file=_wav_buffer(data)
+        )
     except Exception as e:
-        raise RuntimeError(f"Transcription failed: {e}")
\ No newline at end of file
+        raise RuntimeError(f"Transcription failed: {e}")
+    _cache_put(key, result.text)
+    return result.text
+
+async def transcribe_wav_files(paths: List[str]) -> List[str]:
+    """
+    Transcribe a batch of local .wav files concurrently (the work is
+    network-bound, so overlapping the uploads is close to a linear win).
+    Results come back in input order.
+    """
+    sem = asyncio.Semaphore(_TRANSCRIBE_CONCURRENCY)
+
+    async def _one(path: str) -> str:
+        async with sem:
+            data = await asyncio.to_thread(lambda: open(path, "rb").read())
+            return await transcribe_wav_bytes_async(data)
+
+    return list(await asyncio.gather(*(_one(p) for p in paths)))
+
+def transcribe_wav_file(local_wav_path: str) -> str:
+    """
+    Takes the path to a local .wav file and returns the transcription string.
+    """
+    with open(local_wav_path, "rb") as f:
+        return transcribe_wav_bytes(f.read())
@@ -1,20 +1,56 @@
 import os
 import uuid
+import wave
 from pathlib import Path
 from gtts import gTTS
 
 
 AUDIO_DIR = Path(__file__).resolve().parent / "audio"
 
+# Optional local TTS: point LOCAL_TTS_MODEL at a Piper .onnx voice to
+# synthesize on-CPU instead of paying a network round-trip to Google per
+# utterance. The voice is loaded once on first use; missing model or missing
+# piper package falls back to gTTS.
+_piper_voice = None
+_piper_checked = False
+
+
+def _get_piper_voice():
+    global _piper_voice, _piper_checked
+    if _piper_checked:
+        return _piper_voice
+    _piper_checked = True
+    model_path = os.getenv("LOCAL_TTS_MODEL")
+    if not model_path or not os.path.exists(model_path):
+        return None
+    try:
+        from piper import PiperVoice  # lazy: optional dependency
+        _piper_voice = PiperVoice.load(model_path)
+    except Exception:
+        _piper_voice = None
+    return _piper_voice
+
+
 def text_to_mp3(text: str, filename: str | None = None) -> tuple[str, str]:
     """
-    Convert text to an MP3 file using gTTS. Returns (absolute_path, filename).
+    Convert text to an audio file. Uses a local Piper voice when
+    LOCAL_TTS_MODEL is set (WAV output, no network), else gTTS (MP3).
+    Returns (absolute_path, filename).
     """
     AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+
+    voice = _get_piper_voice()
+    if voice is not None:
+        name = filename or f"tts_{uuid.uuid4().hex}.wav"
+        path = AUDIO_DIR / name
+        with wave.open(str(path), "wb") as wav_file:
+            voice.synthesize(text, wav_file)
+        return str(path), name
+
     name = filename or f"tts_{uuid.uuid4().hex}.mp3"
     path = AUDIO_DIR / name
 
     tts = gTTS(text=text, lang="en")
     tts.save(str(path))  # gTTS needs a str path
 
-    return str(path), name
\ No newline at end of file
+    return str(path), name
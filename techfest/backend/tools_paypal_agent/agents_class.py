@@ -1,15 +1,17 @@
-from agents import Agent
-from backend.tools_paypal_agent.toolkit import toolkit
+from functools import lru_cache
 
-tools = toolkit.get_tools()
+from agents import Agent
+from backend.tools_paypal_agent.toolkit import get_toolkit
 
-agent = Agent(
-    name="PayPal Assistant",
-    instructions="""     
-    You're a helpful assistant specialized in managing PayPal transactions:     
-    - To create orders, invoke create_order.     
-    - After approval by user, invoke capture_order.     
-    - To check an order status, invoke get_order_status.     
+@lru_cache(maxsize=1)
+def get_agent() -> Agent:
+    return Agent(
+        name="PayPal Assistant",
+        instructions="""
+    You're a helpful assistant specialized in managing PayPal transactions:
+    - To create orders, invoke create_order.
+    - After approval by user, invoke capture_order.
+    - To check an order status, invoke get_order_status.
     """,
-    tools=tools
-)
\ No newline at end of file
+        tools=get_toolkit().get_tools(),
+    )
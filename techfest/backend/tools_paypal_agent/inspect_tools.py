@@ -1,8 +1,8 @@
 # inspect_tools.py
-from toolkit import toolkit
+from toolkit import get_toolkit
 
 def main():
-    tools = toolkit.get_tools()
+    tools = get_toolkit().get_tools()
     print("Tools available:", [t.name for t in tools])
     for t in tools:
         print("\n==", t.name, "==")
@@ -1,6 +1,12 @@
+import logging
+import os
+from functools import lru_cache
+
 from paypal_agent_toolkit.openai.toolkit import PayPalToolkit
 from paypal_agent_toolkit.shared.configuration import Configuration, Context
-import os
+
+log = logging.getLogger("paypalx.toolkit")
+
 configuration = Configuration(
     actions={
         "orders": {
@@ -21,9 +27,15 @@ def _require(name: str) -> str:
         raise RuntimeError(f"Missing env var: {name}")
     return val
 
-# Read the SAME variables main.py uses
-CLIENT_ID = _require("PAYPAL_CLIENT_ID").strip()
-SECRET    = _require("PAYPAL_CLIENT_SECRET").strip()
-
-# Initialize toolkit
-toolkit = PayPalToolkit(client_id=CLIENT_ID, secret=SECRET, configuration = configuration)
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_toolkit() -> PayPalToolkit:
+    """
+    Build the PayPal toolkit on first use instead of at import time, so
+    merely importing this module (tests, inspect_tools.py) doesn't read env
+    vars or do SDK setup. Reads the SAME variables main.py uses.
+    """
+    return PayPalToolkit(
+        client_id=_require("PAYPAL_CLIENT_ID").strip(),
+        secret=_require("PAYPAL_CLIENT_SECRET").strip(),
+        configuration=configuration,
+    )